@@ -1,25 +1,38 @@
 #!/usr/bin/env python3
 import os
 import sys
-import gzip
+try:
+    from isal import isal_zlib as zlib  # ISA-L inflate, a drop-in for zlib at 2-3x the speed
+except ImportError:
+    import zlib
 import requests
 import hashlib
-import ecdsa
 import base58
+try:
+    import coincurve  # libsecp256k1 bindings, much faster than the pure-Python path
+except ImportError:
+    coincurve = None
 import time
+import threading
 import psutil
 import signal
-from datetime import datetime
-from multiprocessing import Pool, Manager, cpu_count
-from io import BytesIO
+from multiprocessing import cpu_count, get_context, shared_memory
 
 # ================ CONFIGURATION ================
 TSV_GZ_URL = "http://addresses.loyce.club/blockchair_bitcoin_addresses_and_balance_LATEST.tsv.gz"
+FOUND_FILE = "found.txt"
+TARGETS_CACHE = "targets.cache"  # Parsed target table, reused while the database is unchanged
 UPDATE_INTERVAL = 2  # Seconds between stats updates
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # Compressed bytes read per step while streaming the database
 RAM_SAFETY_MARGIN = 0.65  # 65% of available RAM
 MIN_BATCH_SIZE = 10000
 MAX_BATCH_SIZE = 100000
-MAX_WORKERS = min(4, cpu_count())  # Conservative worker count
+STALL_TIMEOUT = 30  # Seconds without a finished batch before in-flight slots are written off
+SHUTDOWN_TIMEOUT = 10  # Seconds to let workers finish before they are terminated
+TARGET_BATCH_SECONDS = 0.5  # Long enough to bury dispatch overhead, short enough to keep results flowing
+MAX_WORKERS = min(4, psutil.cpu_count(logical=False) or cpu_count())  # Conservative, one per physical core
+INVERSION_BATCH = 256  # Consecutive keys sharing one modular inversion
+COMB_WIDTH = 8  # Scalar bits consumed per generator table lookup
 
 # ================ STABILITY CONTROLS ================
 class StabilityManager:
@@ -55,46 +68,491 @@ class StabilityManager:
         
         return not self.safe_mode  # Returns True if normal operations can continue
 
+# ================ SECP256K1 ARITHMETIC ================
+# Pure-Python curve arithmetic; coincurve, when installed, does the full scalar multiplications
+SECP256K1_P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+SECP256K1_G = (
+    0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+    0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8,
+)
+# GLV endomorphism: lambda * (x, y) == (beta * x, y)
+SECP256K1_BETA = 0x7AE96A2B657C07106E64479EAC3434E99CF0497512F58995C1396C28719501EE
+SECP256K1_LAMBDA = 0x5363AD4CC05C30E0A5261C028812645A122E22EA20816678DF02967C1B23BD72
+GLV_A1 = 0x3086D221A7D46BCDE86C90E49284EB15
+GLV_B1 = -0xE4437ED6010E88286F547FA90ABFE4C3
+GLV_A2 = 0x114CA50F7A8E2F3F657C1108D9D44CFD8
+GLV_B2 = GLV_A1
+GENERATOR_TABLE = None
+STEP_TABLE = None
+
+def point_add(p1, p2):
+    """Add two affine points (None is the point at infinity)"""
+    if p1 is None:
+        return p2
+    if p2 is None:
+        return p1
+    
+    x1, y1 = p1
+    x2, y2 = p2
+    if x1 == x2:
+        if (y1 + y2) % SECP256K1_P == 0:
+            return None
+        slope = 3 * x1 * x1 * pow(2 * y1, -1, SECP256K1_P)
+    else:
+        slope = (y2 - y1) * pow(x2 - x1, -1, SECP256K1_P)
+    
+    x3 = (slope * slope - x1 - x2) % SECP256K1_P
+    return (x3, (slope * (x1 - x3) - y1) % SECP256K1_P)
+
+def split_scalar(k):
+    """GLV split of k into k1 + k2 * lambda (mod n) with |k1|, |k2| < 2^128"""
+    c1 = (GLV_B2 * k + SECP256K1_N // 2) // SECP256K1_N
+    c2 = (-GLV_B1 * k + SECP256K1_N // 2) // SECP256K1_N
+    k1 = k - c1 * GLV_A1 - c2 * GLV_A2
+    k2 = -c1 * GLV_B1 - c2 * GLV_B2
+    return k1, k2
+
+def generator_table():
+    """Fixed-base table: row w holds j * 2^(COMB_WIDTH*w) * G for digits 1..2^(COMB_WIDTH-1)
+    
+    Digits are signed, so negative ones reuse the same entries with y negated.
+    One extra row absorbs the carry out of the top window.
+    """
+    global GENERATOR_TABLE
+    if GENERATOR_TABLE is None:
+        table = []
+        base = SECP256K1_G
+        for _ in range(128 // COMB_WIDTH + 1):
+            row = [None, base]
+            for _ in range(2, (1 << (COMB_WIDTH - 1)) + 1):
+                row.append(point_add(row[-1], base))
+            table.append(row)
+            base = point_add(row[-1], row[-1])
+        GENERATOR_TABLE = table
+    return GENERATOR_TABLE
+
+def jacobian_double(point):
+    """Double a Jacobian point (X, Y, Z) on y^2 = x^3 + 7"""
+    X, Y, Z = point
+    p = SECP256K1_P
+    a = X * X % p
+    b = Y * Y % p
+    c = b * b % p
+    d = 2 * ((X + b) * (X + b) - a - c) % p
+    e = 3 * a % p
+    x3 = (e * e - 2 * d) % p
+    return (x3, (e * (d - x3) - 8 * c) % p, 2 * Y * Z % p)
+
+def jacobian_add_affine(point, x2, y2):
+    """Mixed addition of a Jacobian point and an affine point, no inversion"""
+    if point is None:
+        return (x2, y2, 1)
+    
+    X, Y, Z = point
+    p = SECP256K1_P
+    zz = Z * Z % p
+    h = (x2 * zz - X) % p
+    r = (y2 * zz * Z - Y) % p
+    if h == 0:
+        return jacobian_double(point) if r == 0 else None
+    
+    hh = h * h % p
+    hhh = h * hh % p
+    v = X * hh % p
+    x3 = (r * r - hhh - 2 * v) % p
+    return (x3, (r * (v - x3) - Y * hhh) % p, Z * h % p)
+
+def batch_inverse(values):
+    """Invert many field elements with a single inversion (Montgomery's trick)"""
+    p = SECP256K1_P
+    prefix = []
+    acc = 1
+    for value in values:
+        acc = acc * value % p
+        prefix.append(acc)
+    
+    inv = pow(acc, -1, p)
+    inverses = [None] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        inverses[i] = inv * prefix[i - 1] % p
+        inv = inv * values[i] % p
+    inverses[0] = inv
+    return inverses
+
+def generator_multiply(k):
+    """Compute affine k * G as k1 * G + k2 * phi(G), one table addition per window"""
+    if not 1 <= k < SECP256K1_N:
+        raise ValueError("Private key out of range")
+    
+    table = generator_table()
+    mask = (1 << COMB_WIDTH) - 1
+    top = 1 << (COMB_WIDTH - 1)
+    point = None
+    for half, endomorphism in zip(split_scalar(k), (False, True)):
+        negate = half < 0
+        half = abs(half)
+        for row in table:
+            digit = half & mask
+            half >>= COMB_WIDTH
+            if digit > top:
+                # Signed digit: borrow from the next window instead
+                digit -= 1 << COMB_WIDTH
+                half += 1
+            if digit:
+                x, y = row[abs(digit)]
+                if endomorphism:
+                    x = x * SECP256K1_BETA % SECP256K1_P
+                if (digit < 0) != negate:
+                    y = SECP256K1_P - y
+                point = jacobian_add_affine(point, x, y)
+    
+    X, Y, Z = point
+    zinv = pow(Z, -1, SECP256K1_P)
+    zinv2 = zinv * zinv % SECP256K1_P
+    return (X * zinv2 % SECP256K1_P, Y * zinv2 * zinv % SECP256K1_P)
+
+def step_table():
+    """Affine multiples 1*G .. INVERSION_BATCH*G used to step through consecutive keys"""
+    global STEP_TABLE
+    if STEP_TABLE is None:
+        table = [SECP256K1_G]
+        while len(table) < INVERSION_BATCH:
+            table.append(point_add(table[-1], SECP256K1_G))
+        STEP_TABLE = table
+    return STEP_TABLE
+
+# ================ KEY DERIVATION ================
+COMPRESSED_TAGS = (2 << 256, 3 << 256)  # 0x02/0x03 prefix, picked by the parity of y
+def base_point(k):
+    """Affine public point for private key k, via libsecp256k1 when available"""
+    if coincurve is not None:
+        return coincurve.PublicKey.from_secret(k.to_bytes(32, 'big')).point()
+    return generator_multiply(k)
+
+def consecutive_pubkeys(k, count):
+    """Yield compressed public keys for private keys k, k+1, ..., k+count-1
+    
+    Only k * G needs a scalar multiplication; each following key is the
+    previous point plus a multiple of G, added in affine coordinates. The
+    x-differences of every INVERSION_BATCH additions are inverted together
+    by batch_inverse(), so they share one modular inversion.
+    """
+    if k + count > SECP256K1_N:
+        raise ValueError("Private key out of range")
+    
+    p = SECP256K1_P
+    tags = COMPRESSED_TAGS
+    steps = step_table()
+    x, y = base_point(k)
+    yield (tags[y & 1] | x).to_bytes(33, 'big')
+    
+    remaining = count - 1
+    while remaining > 0:
+        batch = steps[:min(INVERSION_BATCH, remaining)]
+        diffs = [sx - x for sx, _ in batch]
+        if 0 in diffs:
+            # Base point is +/- a step point (only for tiny keys); go one step at a time
+            points = [point_add((x, y), step) for step in batch]
+        else:
+            points = []
+            for (sx, sy), inv in zip(batch, batch_inverse(diffs)):
+                slope = (sy - y) * inv % p
+                x3 = (slope * slope - x - sx) % p
+                points.append((x3, (slope * (x - x3) - y) % p))
+        
+        for x3, y3 in points:
+            yield (tags[y3 & 1] | x3).to_bytes(33, 'big')
+        
+        # The last point of this batch is the base for the next one
+        x, y = x3, y3
+        remaining -= len(batch)
+
+def check_curve_arithmetic():
+    """Known-answer check of the pure-Python path, which coincurve installs never exercise"""
+    p = SECP256K1_P
+    gx, gy = SECP256K1_G
+    expected = [
+        (1, SECP256K1_G),
+        (2, point_add(SECP256K1_G, SECP256K1_G)),
+        (3, (0xF9308A019258C31049344F85F89D5229B531C845836F99B08601F113BCE036F9,
+             0x388F7B0F632DE8140FE337E62A37F3566500A99934C2231B6CB9FD7584B8E672)),
+        (SECP256K1_N - 1, (gx, p - gy)),
+        (SECP256K1_LAMBDA, (SECP256K1_BETA * gx % p, gy)),  # The endomorphism split_scalar relies on
+    ]
+    if any(generator_multiply(k) != point for k, point in expected):
+        return False
+    
+    # Every precomputed point must lie on y^2 = x^3 + 7
+    entries = [point for row in generator_table() for point in row[1:]] + step_table()
+    if any((y * y - x * x * x - 7) % p for x, y in entries):
+        return False
+    
+    # Where libsecp256k1 is installed, the fallback must agree with it on random keys
+    if coincurve is not None:
+        for _ in range(8):
+            k = int.from_bytes(os.urandom(32), 'big') % (SECP256K1_N - 1) + 1
+            if generator_multiply(k) != base_point(k):
+                return False
+    
+    # Consecutive keys across an inversion batch boundary must match direct multiplication
+    k = SECP256K1_N // 3
+    pubkeys = list(consecutive_pubkeys(k, INVERSION_BATCH + 2))
+    for i in (0, 1, INVERSION_BATCH, INVERSION_BATCH + 1):
+        x, y = generator_multiply(k + i)
+        if pubkeys[i] != (COMPRESSED_TAGS[y & 1] | x).to_bytes(33, 'big'):
+            return False
+    return True
+
+# ================ TARGET INDEX ================
+def drop_page_cache(f):
+    """Tell the kernel a file's cached pages won't be read again (Linux only, best effort)"""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass  # Only a hint; the file itself is fine
+
+class TargetIndex:
+    """Open-addressing hash table of raw 20-byte hash160s in one flat buffer"""
+    SLOT_SIZE = 20
+    EMPTY = bytes(SLOT_SIZE)
+    
+    def __init__(self, slots=1 << 16):
+        self.mask = slots - 1
+        self.table = bytearray(slots * self.SLOT_SIZE)
+        self.count = 0
+        self.has_empty_hash = False  # The all-zero hash160 doubles as the empty marker
+        self.shm = None
+        
+    def __len__(self):
+        return self.count + self.has_empty_hash
+    
+    def _find(self, h160):
+        """Return the offset of h160's slot, or of the empty slot where it belongs"""
+        table = self.table
+        slot = int.from_bytes(h160[:8], 'little') & self.mask
+        while True:
+            offset = slot * self.SLOT_SIZE
+            entry = table[offset:offset + self.SLOT_SIZE]
+            if entry == h160 or entry == self.EMPTY:
+                return offset
+            slot = (slot + 1) & self.mask
+    
+    def add(self, h160):
+        if h160 == self.EMPTY:
+            self.has_empty_hash = True
+            return
+        
+        offset = self._find(h160)
+        if self.table[offset:offset + self.SLOT_SIZE] == self.EMPTY:
+            self.table[offset:offset + self.SLOT_SIZE] = h160
+            self.count += 1
+            # Keep the load factor under 50% so misses end after a probe or two
+            if self.count * 2 > self.mask:
+                self._grow()
+    
+    def _grow(self):
+        old = self.table
+        self.mask = self.mask * 2 + 1
+        self.table = bytearray(len(old) * 2)
+        for offset in range(0, len(old), self.SLOT_SIZE):
+            entry = bytes(old[offset:offset + self.SLOT_SIZE])
+            if entry != self.EMPTY:
+                new_offset = self._find(entry)
+                self.table[new_offset:new_offset + self.SLOT_SIZE] = entry
+    
+    def __contains__(self, h160):
+        if h160 == self.EMPTY:
+            return self.has_empty_hash
+        offset = self._find(h160)
+        return self.table[offset:offset + self.SLOT_SIZE] == h160
+    
+    def share(self):
+        """Move the finished table into shared memory so workers map it instead of copying it"""
+        self.shm = shared_memory.SharedMemory(create=True, size=len(self.table))
+        self.shm.buf[:len(self.table)] = self.table
+        self.table = self.shm.buf
+    
+    def close(self, unlink=False):
+        if self.shm is not None:
+            self.table = None
+            self.shm.close()
+            if unlink:
+                self.shm.unlink()
+            self.shm = None
+    
+    def save(self, path, version):
+        """Write the table to path, tagged with the database version it was built from"""
+        try:
+            with open(path + '.tmp', 'wb') as f:
+                f.write(f"{version}\t{self.count}\t{int(self.has_empty_hash)}\n".encode())
+                f.write(self.table)
+                f.flush()
+                os.fsync(f.fileno())  # Clean pages can be dropped, and the rename below lands on full data
+                drop_page_cache(f)
+            os.replace(path + '.tmp', path)  # Never leave a half-written cache behind
+        except OSError:
+            try:
+                os.remove(path + '.tmp')
+            except OSError:
+                pass
+            raise
+    
+    @classmethod
+    def load(cls, path, version):
+        """Read a table saved for this database version, or None if there is none"""
+        try:
+            with open(path, 'rb') as f:
+                saved, count, has_empty_hash = f.readline().decode().rstrip('\n').split('\t')
+                if saved != version:
+                    return None
+                index = cls(1)
+                index.table = bytearray(os.fstat(f.fileno()).st_size - f.tell())
+                f.readinto(index.table)
+                drop_page_cache(f)  # The table now lives in memory; don't keep a second copy cached
+            count = int(count)
+        except (OSError, ValueError):
+            return None
+        
+        # Probing relies on a power-of-two slot count kept under half full
+        slots, partial = divmod(len(index.table), cls.SLOT_SIZE)
+        if partial or slots == 0 or slots & (slots - 1) or not 0 <= count * 2 <= slots:
+            return None
+        index.mask = slots - 1
+        index.count = count
+        index.has_empty_hash = has_empty_hash == '1'
+        return index
+    
+    def __getstate__(self):
+        # Shared tables travel by name; workers attach instead of unpickling the bytes
+        state = self.__dict__.copy()
+        if self.shm is not None:
+            state['shm'] = self.shm.name
+            state['table'] = None
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.shm is not None:
+            self.shm = shared_memory.SharedMemory(name=self.shm)
+            self.table = self.shm.buf
+
+BASE58_DIGITS = bytearray(b'\xff' * 256)
+for value, char in enumerate(b'123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'):
+    BASE58_DIGITS[char] = value
+BASE58_DIGITS = bytes(BASE58_DIGITS)
+
+def p2pkh_hash160(addr):
+    """Return the hash160 inside a base58 P2PKH address (bytes), or None if it isn't one
+    
+    Skips the checksum: a corrupt database line can only add a hash160
+    that no derived key will ever produce.
+    """
+    digits = addr.translate(BASE58_DIGITS)
+    if b'\xff' in digits:
+        return None
+    value = 0
+    for digit in digits:
+        value = value * 58 + digit
+    if value >> 192:  # Version byte must be 0x00
+        return None
+    return value.to_bytes(25, 'big')[1:21]
+
+def iter_tsv_lines(response):
+    """Yield raw lines of the gzipped TSV as it downloads, never holding the whole body
+    
+    Reads every gzip member, like GzipFile, and raises EOFError if the body
+    stops before the end of the gzip stream.
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    tail = b''
+    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+        data = decompressor.decompress(chunk)
+        while decompressor.eof:
+            # Concatenated members: continue with a fresh decompressor (trailing NUL padding is ignored)
+            rest = decompressor.unused_data.lstrip(b'\x00')
+            if not rest:
+                break
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            data += decompressor.decompress(rest)
+        lines = (tail + data).split(b'\n')
+        tail = lines.pop()
+        yield from lines
+    
+    data = decompressor.flush()
+    if not decompressor.eof:
+        raise EOFError("Address database download ended mid-stream")
+    yield from (tail + data).split(b'\n')
+
 # ================ RESILIENT WORKER SYSTEM ================
-def resilient_worker(batch, targets, worker_id):
-    """Worker process with built-in recovery"""
+WORKER_TARGETS = None
+WORKER_PROGRESS = None
+WORKER_STOP = None
+
+def exit_worker(sig, frame):
+    sys.exit(0)
+
+def init_worker(targets, progress, stop):
+    """Pool initializer: keep the shared target index, key counter and stop flag for every batch"""
+    global WORKER_TARGETS, WORKER_PROGRESS, WORKER_STOP
+    # Shutdown is driven by the main process; a Ctrl+C to the whole group must not kill a batch midway.
+    # SIGTERM (what Pool.terminate() sends) still ends the worker, quietly and with its locks released.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, exit_worker)
+    WORKER_TARGETS = targets
+    WORKER_PROGRESS = progress
+    WORKER_STOP = stop
+
+def resilient_worker(task):
+    """Worker process with built-in recovery; scans count consecutive keys from a random seed"""
+    count, worker_id = task
     results = []
     start_time = time.time()
+    targets = WORKER_TARGETS
+    sha256 = hashlib.sha256
+    # Copying a blank context skips hashlib.new()'s by-name digest lookup on every key
+    new_ripemd160 = hashlib.new('ripemd160').copy
+    i = -1
     
     try:
-        for i, pk in enumerate(batch):
-            # Memory check
-            if i % 1000 == 0 and psutil.virtual_memory().percent > 95:
-                print(f"\nWorker {worker_id}: High RAM, skipping batch")
-                return []
-                
+        base = int.from_bytes(os.urandom(32), 'big')  # Keys never leave this process
+        for i, pubkey in enumerate(consecutive_pubkeys(base, count)):
             # Process key
-            sk = ecdsa.SigningKey.from_string(pk, curve=ecdsa.SECP256k1)
-            x = sk.verifying_key.pubkey.point.x()
-            y = sk.verifying_key.pubkey.point.y()
-            pubkey = (b'\x03' if y % 2 else b'\x02') + x.to_bytes(32, 'big')
-            h160 = hashlib.new('ripemd160', hashlib.sha256(pubkey).digest()).digest()
-            addr = base58.b58encode_check(b'\x00' + h160).decode()
+            ripemd = new_ripemd160()
+            ripemd.update(sha256(pubkey).digest())
+            h160 = ripemd.digest()
             
-            if addr in targets:
-                wif = base58.b58encode_check(b'\x80' + pk + b'\x01').decode()
-                results.append(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}|{addr}|{wif}\n")
+            if h160 in targets:
+                results.append((h160, base + i))  # Encoded by the main process
                 
-            # Yield control periodically
-            if i % 500 == 0:
-                time.sleep(0.001)
+            # Cut the batch short on shutdown
+            if i % 500 == 0 and WORKER_STOP.is_set():
+                break
                 
     except Exception as e:
         print(f"\nWorker {worker_id} error: {str(e)}")
         return []
     
+    finally:
+        # One locked add per batch, so workers never contend on the counter
+        with WORKER_PROGRESS.get_lock():
+            WORKER_PROGRESS.value += i + 1
+    
     return results
 
 # ================ MAIN CONTROLLER ================
 def main_loop():
     """Primary scanning loop with recovery mechanisms"""
     stability = StabilityManager()
-    manager = Manager()
+    # Fork on Linux even where the default is spawn/forkserver: workers then skip
+    # re-importing this script and inherit the tables below copy-on-write
+    mp = get_context('fork' if sys.platform.startswith('linux') else None)
+    
+    # The self-test builds both curve tables, once, so forked workers inherit them
+    if not check_curve_arithmetic():
+        print("\n❌ secp256k1 self-test failed, refusing to scan with wrong keys")
+        return False
     
     # Load targets first
     print("\n🔍 Loading address database...")
@@ -102,21 +560,36 @@ def main_loop():
         response = requests.get(TSV_GZ_URL, stream=True, timeout=60)
         response.raise_for_status()
         
-        targets = set()
-        with gzip.GzipFile(fileobj=BytesIO(response.content)) as f:
-            for line in f:
-                try:
-                    addr = line.decode().split('\t')[0]
-                    if 26 <= len(addr) <= 35:
-                        targets.add(addr)
-                except:
-                    continue
+        # Skip the download when the table was already built from this exact file
+        version = response.headers.get('ETag') or response.headers.get('Last-Modified')
+        targets = TargetIndex.load(TARGETS_CACHE, version) if version else None
+        if targets is not None:
+            response.close()
+            print("♻️  Using cached address table")
+        else:
+            targets = TargetIndex()
+            for n, line in enumerate(iter_tsv_lines(response)):
+                addr = line.split(b'\t', 1)[0]
+                # Only P2PKH addresses can match the keys we derive
+                if addr[:1] == b'1' and 26 <= len(addr) <= 35:
+                    h160 = p2pkh_hash160(addr)
+                    if h160 is not None:
+                        targets.add(h160)
                 
                 # Early exit if memory is constrained
-                if psutil.virtual_memory().percent > 90:
+                if n % 100000 == 0 and psutil.virtual_memory().percent > 90:
                     print("\n⚠️  Memory limit reached during load")
                     break
+            else:
+                # Reached only when the gzip stream hit its end: iter_tsv_lines raises
+                # on a cut-off body, and the memory guard above skips this via break
+                if version:
+                    try:
+                        targets.save(TARGETS_CACHE, version)
+                    except OSError as e:  # The cache only saves time; scan without it
+                        print(f"\n⚠️  Could not cache address table: {str(e)}")
         
+        targets.share()
         print(f"✅ Loaded {len(targets):,} addresses")
         
     except Exception as e:
@@ -124,47 +597,95 @@ def main_loop():
         return False
 
     # Initialize shared resources
-    stats = manager.dict({
+    progress = mp.Value('Q', 0)  # Keys checked, summed by the workers themselves
+    stats = {  # Written only by the main thread; batches() also reads 'speed' from the task-handler thread
         'total': 0,
         'speed': 0,
         'found': 0,
         'start_time': time.time()
-    })
-    result_queue = manager.Queue()
+    }
+    found_file = open(FOUND_FILE, "a", buffering=1)  # Line-buffered: each hit hits disk at once
+    slots = threading.Condition()
+    in_flight = 0  # Batches handed to the pool and not yet returned; MAX_WORKERS * 2 keeps every worker fed
+    stopping = mp.Event()  # Ends batch generation here and cuts running batches short in the workers
+    
+    def batches():
+        """Yield batch tasks forever; runs on the pool's task-handler thread"""
+        nonlocal in_flight
+        batch_count = 0
+        while not stopping.is_set():
+            if not stability.check_system_health():
+                time.sleep(5)  # Wait if in safe mode
+                continue
+            
+            # Block until a result is collected, so safe mode takes effect at once
+            with slots:
+                slots.wait_for(lambda: in_flight < MAX_WORKERS * 2 or stopping.is_set(), UPDATE_INTERVAL)
+                if in_flight >= MAX_WORKERS * 2 or stopping.is_set():
+                    continue
+                in_flight += 1
+            
+            # Dynamic batch sizing: aim for TARGET_BATCH_SECONDS per batch at the measured speed
+            if stability.safe_mode:
+                batch_size = MIN_BATCH_SIZE
+            else:
+                batch_size = int(stats['speed'] / MAX_WORKERS * TARGET_BATCH_SECONDS)
+                batch_size = max(MIN_BATCH_SIZE, min(MAX_BATCH_SIZE, batch_size))
+            yield batch_size, batch_count % MAX_WORKERS
+            batch_count += 1
+    
+    def free_slots(count):
+        nonlocal in_flight
+        with slots:
+            in_flight = max(0, in_flight - count)  # Late results of reclaimed batches must not go below zero
+            slots.notify_all()
+    
+    def record(hits):
+        # Stamp and encode the hits here, so workers only hand back (hash160, key) pairs
+        for h160, key in hits:
+            addr = base58.b58encode_check(b'\x00' + h160).decode()
+            wif = base58.b58encode_check(b'\x80' + key.to_bytes(32, 'big') + b'\x01').decode()
+            found_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}|{addr}|{wif}\n")
+            stats['found'] += 1
     
     # Worker pool with limited retries
-    with Pool(MAX_WORKERS) as pool:
+    with mp.Pool(MAX_WORKERS, initializer=init_worker, initargs=(targets, progress, stopping)) as pool:
+        results = None
         try:
-            batch_count = 0
             last_display = time.time()
             
-            while stability.restart_count < stability.max_restarts:
-                if not stability.check_system_health():
-                    time.sleep(5)  # Wait if in safe mode
-                    continue
-                    
-                # Dynamic batch sizing
-                batch_size = MIN_BATCH_SIZE if stability.safe_mode else MAX_BATCH_SIZE
-                batch = [os.urandom(32) for _ in range(batch_size)]
-                
-                # Process batch
-                pool.apply_async(
-                    resilient_worker,
-                    args=(batch, targets, batch_count % MAX_WORKERS),
-                    callback=lambda r: (
-                        result_queue.put(r),
-                        stats.update({'found': stats['found'] + len(r)})
-                    ) if r else None
-                )
+            results = pool.imap_unordered(resilient_worker, batches())
+            workers = {worker.pid for worker in mp.active_children()}
+            last_result = time.time()
+            while True:
+                # Wake up every interval even when nothing finishes, to keep the display and slots alive
+                try:
+                    hits = results.next(timeout=UPDATE_INTERVAL)
+                except mp.TimeoutError:
+                    hits = None
+                except StopIteration:
+                    break
+                if hits is not None:
+                    free_slots(1)
+                    record(hits)
+                    last_result = time.time()
                 
-                # Update stats
-                stats['total'] += batch_size
-                stats['speed'] = batch_size / (time.time() - stats.get('last_batch_time', time.time()))
-                stats['last_batch_time'] = time.time()
-                batch_count += 1
+                # A dead worker (OOM kill, crash) never returns its batch: hand the slot back.
+                # The pool starts a replacement, which shows up here under a new pid.
+                current = {worker.pid for worker in mp.active_children()}
+                lost = len(workers - current)
+                workers = current
+                if time.time() - last_result > STALL_TIMEOUT:
+                    lost = in_flight  # Nothing finished for too long: assume every batch is gone
+                    last_result = time.time()
+                if lost:
+                    free_slots(lost)
                 
                 # Display progress
                 if time.time() - last_display > UPDATE_INTERVAL:
+                    total = progress.value
+                    stats['speed'] = (total - stats['total']) / (time.time() - last_display)
+                    stats['total'] = total
                     ram = psutil.virtual_memory()
                     elapsed = time.time() - stats['start_time']
                     print(
@@ -177,15 +698,6 @@ def main_loop():
                     )
                     last_display = time.time()
                 
-                # Save results
-                if not result_queue.empty():
-                    with open("found.txt", "a") as f:
-                        while not result_queue.empty():
-                            f.writelines(result_queue.get())
-                
-                # Gentle sleep to prevent CPU hogging
-                time.sleep(0.1)
-                
         except Exception as e:
             print(f"\n⚠️  Main loop error: {str(e)}")
             stability.restart_count += 1
@@ -193,13 +705,31 @@ def main_loop():
             
         finally:
             print("\n🔁 Cleaning up workers...")
+            stopping.set()
+            free_slots(0)  # Wake batches() if it is waiting for a slot
             pool.close()
-            pool.join()
             
-            # Final save
-            with open("found.txt", "a") as f:
-                while not result_queue.empty():
-                    f.writelines(result_queue.get())
+            # Pool.join() has no timeout, so wait on it from a helper thread
+            joiner = threading.Thread(target=pool.join, daemon=True)
+            joiner.start()
+            joiner.join(SHUTDOWN_TIMEOUT)
+            if joiner.is_alive():
+                print(f"\n⚠️  Workers still busy after {SHUTDOWN_TIMEOUT}s, terminating")
+                for worker in mp.active_children():
+                    worker.terminate()
+                    worker.join(1)
+                    if worker.exitcode is None:
+                        worker.kill()
+                pool.terminate()
+            
+            # Keep the hits of batches that finished during join()
+            while results is not None:
+                try:
+                    record(results.next(timeout=0))
+                except Exception:  # Drained (TimeoutError) or a failed batch
+                    break
+            found_file.close()
+            targets.close(unlink=True)
     
     return True
 
@@ -226,4 +756,4 @@ if __name__ == "__main__":
     else:
         print("\n⚠️  Scan ended with warnings")
     
-    print("Results saved to found.txt")
+    print(f"Results saved to {FOUND_FILE}")